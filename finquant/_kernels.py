@@ -0,0 +1,71 @@
+"""The module provides kernels which compute quantities of stock prices with
+`NumPy` on a contiguous ``numpy.ndarray``, without the overhead of
+intermediate ``pandas`` objects.
+
+The kernels are deliberately not compiled just-in-time, e.g. with `numba`:
+compiling them takes about a second on their first use in a process, which
+is far more than they take for typical portfolios, and every ``Stock`` uses
+them when it is created.
+
+The kernels expect regular stock prices, i.e. finite and non-zero values
+(see ``is_regular``). Prices with gaps must be handled by the `pandas` based
+functions in ``finquant.returns``, which treat missing values accordingly.
+"""
+
+
+import numpy as np
+
+
+def is_regular(prices):
+    """Returns True if all given prices are finite and non-zero, hence daily
+    returns can be computed without any special treatment of missing values.
+
+    :Input:
+     :prices: ``numpy.ndarray`` of stock prices
+    """
+    return bool(np.all(np.isfinite(prices) & (prices != 0)))
+
+
+def _as_float_array(prices):
+    """Returns prices as contiguous array of floats. ``float32`` prices are
+    kept as they are, all others are converted to ``float64``.
+    """
+    prices = np.ascontiguousarray(prices)
+    if prices.dtype not in (np.float32, np.float64):
+        prices = prices.astype(np.float64)
+    return prices
+
+
+def volatility(prices, freq=252):
+    """Computes the Volatility (standard deviation of the daily returns,
+    scaled by ``sqrt(freq)``) of a single stock.
+
+    :Input:
+     :prices: ``numpy.ndarray`` of regular daily stock prices (one dimensional),
+         ``float32`` prices are not converted
+     :freq: ``int`` (default= ``252``), number of trading days, default
+         value corresponds to trading days in a year
+
+    :Output:
+     :volatility: ``float``, the Volatility of the stock.
+    """
+    prices = _as_float_array(prices)
+    returns = prices[1:] / prices[:-1] - 1.0
+    return float(np.std(returns, ddof=1, dtype=np.float64) * np.sqrt(freq))
+
+
+def mean_returns(prices, freq=252):
+    """Computes the mean daily returns, scaled by ``freq``, of several stocks.
+
+    :Input:
+     :prices: ``numpy.ndarray`` of regular daily stock prices, one column
+         per stock, ``float32`` prices are not converted
+     :freq: ``int`` (default= ``252``), number of trading days, default
+         value corresponds to trading days in a year
+
+    :Output:
+     :mean_returns: ``numpy.ndarray`` of the mean returns of the stocks.
+    """
+    prices = _as_float_array(prices)
+    returns = prices[1:] / prices[:-1] - 1.0
+    return np.mean(returns, axis=0, dtype=np.float64) * freq
@@ -4,10 +4,11 @@ Monte Carlo run to find optimised financial portfolios, given an intial portfoli
 """
 
 
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import pandas as pd
 import matplotlib.pylab as plt
-from finquant.quants import annualised_portfolio_quantities
+from finquant.quants import annualised_portfolio_quantities_batch
 
 
 class MonteCarlo(object):
@@ -51,6 +52,7 @@ class MonteCarloOpt(MonteCarlo):
         risk_free_rate=0.005,
         freq=252,
         initial_weights=None,
+        n_jobs=1,
     ):
         """
         :Input:
@@ -68,6 +70,8 @@ class MonteCarloOpt(MonteCarlo):
          :initial_weights: ``list``/``numpy.ndarray`` (default: ``None``), weights of
              initial/given portfolio, only used to plot a marker for the
              initial portfolio in the optimisation plot.
+         :n_jobs: ``int`` (default: ``1``), number of threads the computation
+             of the randomly generated portfolios is split across.
 
         :Output:
          :opt: ``pandas.DataFrame`` with optimised investment strategies for maximum
@@ -86,11 +90,14 @@ class MonteCarloOpt(MonteCarlo):
             raise ValueError("risk_free_rate is expected to be an integer or float.")
         if not isinstance(freq, int):
             raise ValueError("freq is expected to be an integer.")
+        if not isinstance(n_jobs, int) or n_jobs <= 0:
+            raise ValueError("n_jobs is expected to be a positive integer.")
         self.returns = returns
         self.num_trials = num_trials
         self.risk_free_rate = risk_free_rate
         self.freq = freq
         self.initial_weights = initial_weights
+        self.n_jobs = n_jobs
         # initiate super class
         super(MonteCarloOpt, self).__init__(num_trials=self.num_trials)
         # setting additional variables
@@ -103,23 +110,25 @@ class MonteCarloOpt(MonteCarlo):
         self.opt_weights = None
         self.opt_results = None
 
-    def _random_weights(self):
-        """Computes random weights for the stocks of a portfolio and the
-        corresponding Expected Return, Volatility and Sharpe Ratio.
+    def _portfolio_quantities(self, weights):
+        """Computes the Expected Return, Volatility and Sharpe Ratio of
+        portfolios with the given weights.
+        See ``finquant.quants.annualised_portfolio_quantities_batch``.
+
+        :Input:
+         :weights: ``numpy.ndarray`` of weights, one row per portfolio
 
         :Output:
-         :(weights, quantities): Tuple of weights (np.ndarray) and a
-             list of [expected return, volatility, sharpe ratio].
+         :quantities: ``numpy.ndarray`` of [expected return, volatility,
+             sharpe ratio], one row per portfolio.
         """
-        # select random weights for portfolio
-        w = np.array(np.random.random(self.num_stocks))
-        # rebalance weights
-        w = w / np.sum(w)
-        # compute portfolio return and volatility
-        portfolio_values = annualised_portfolio_quantities(
-            w, self.return_means, self.cov_matrix, self.risk_free_rate, self.freq
+        return annualised_portfolio_quantities_batch(
+            weights,
+            self.return_means,
+            self.cov_matrix,
+            self.risk_free_rate,
+            self.freq,
         )
-        return (w, np.array(portfolio_values))
 
     def _random_portfolios(self):
         """Performs a Monte Carlo run and gets a list of random portfolios
@@ -132,13 +141,27 @@ class MonteCarloOpt(MonteCarlo):
          :df_results: ``pandas.DataFrame``, holds Expected Annualised Return,
              Volatility and Sharpe Ratio of each randomly generated portfolio
         """
-        # run Monte Carlo to get random weights and corresponding quantities
-        res = self.run(self._random_weights)
+        # select random weights for all portfolios at once, this draws the
+        # same random numbers as selecting them portfolio by portfolio
+        weights = np.random.random((self.num_trials, self.num_stocks))
+        # rebalance weights
+        weights = weights / np.sum(weights, axis=1)[:, np.newaxis]
+        # compute portfolio quantities, split across n_jobs threads
+        # (numpy releases the GIL in the underlying operations)
+        n_jobs = min(self.n_jobs, self.num_trials)
+        if n_jobs > 1:
+            chunks = np.array_split(weights, n_jobs)
+            with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+                results = np.concatenate(
+                    list(executor.map(self._portfolio_quantities, chunks))
+                )
+        else:
+            results = self._portfolio_quantities(weights)
         # convert to pandas.DataFrame:
         weights_columns = list(self.returns.columns)
         result_columns = ["Expected Return", "Volatility", "Sharpe Ratio"]
-        df_weights = pd.DataFrame(data=res[:, 0].tolist(), columns=weights_columns)
-        df_results = pd.DataFrame(data=res[:, 1].tolist(), columns=result_columns)
+        df_weights = pd.DataFrame(data=weights, columns=weights_columns)
+        df_results = pd.DataFrame(data=results, columns=result_columns)
         return (df_weights, df_results)
 
     def optimisation(self):
@@ -219,13 +242,7 @@ class MonteCarloOpt(MonteCarlo):
         # also set marker for initial portfolio, if weights were given
         if self.initial_weights is not None:
             # computed expected return and volatility of initial portfolio
-            initial_values = annualised_portfolio_quantities(
-                self.initial_weights,
-                self.return_means,
-                self.cov_matrix,
-                self.risk_free_rate,
-                self.freq,
-            )
+            initial_values = self._portfolio_quantities(self.initial_weights)[0]
             initial_return = initial_values[0]
             initial_volatility = initial_values[1]
             plt.scatter(
@@ -48,6 +48,7 @@ Finally, functions are implemented to generated the following plots:
 """
 
 
+import re
 import numpy as np
 import pandas as pd
 import matplotlib.pylab as plt
@@ -57,6 +58,7 @@ from finquant.returns import daily_returns, cumulative_returns
 from finquant.returns import daily_log_returns
 from finquant.efficient_frontier import EfficientFrontier
 from finquant.monte_carlo import MonteCarloOpt
+from finquant._kernels import is_regular, mean_returns, volatility
 
 
 class Stock(object):
@@ -117,7 +119,7 @@ class Stock(object):
         :Output:
          :expected_return: Expected Return of stock.
         """
-        return historical_mean_return(self.data, freq=freq)
+        return _mean_returns(self.data, freq=freq)
 
     def comp_volatility(self, freq=252):
         """Computes the Volatility of the stock.
@@ -129,15 +131,23 @@ class Stock(object):
         :Output:
          :volatility: Volatility of stock.
         """
+        prices = _prices_array(self.data)
+        if prices.shape[1] == 1 and len(prices) > 2 and is_regular(prices):
+            # single pass over the stock prices, see finquant._kernels
+            return pd.Series(
+                [volatility(prices.ravel(), freq)], index=self.data.columns
+            )
         return self.comp_daily_returns().std() * np.sqrt(freq)
 
     def _comp_skew(self):
         """Computes and returns the skewness of the stock."""
-        return self.data.skew().values[0]
+        # compute the scalar directly from the (first) data column
+        return self.data.iloc[:, 0].skew()
 
     def _comp_kurtosis(self):
         """Computes and returns the Kurtosis of the stock."""
-        return self.data.kurt().values[0]
+        # compute the scalar directly from the (first) data column
+        return self.data.iloc[:, 0].kurt()
 
     def properties(self):
         """Nicely prints out the properties of the stock: Expected Return,
@@ -145,17 +155,18 @@ class Stock(object):
         information provided in investmentinfo.)
         """
         # nicely printing out information and quantities of the stock
-        string = "-" * 50
-        string += "\nStock: {}".format(self.name)
-        string += "\nExpected Return:{:0.3f}".format(self.expected_return.values[0])
-        string += "\nVolatility: {:0.3f}".format(self.volatility.values[0])
-        string += "\nSkewness: {:0.5f}".format(self.skew)
-        string += "\nKurtosis: {:0.5f}".format(self.kurtosis)
-        string += "\nInformation:"
-        string += "\n" + str(self.investmentinfo.to_frame().transpose())
-        string += "\n"
-        string += "-" * 50
-        print(string)
+        lines = [
+            "-" * 50,
+            "Stock: {}".format(self.name),
+            "Expected Return:{:0.3f}".format(self.expected_return.values[0]),
+            "Volatility: {:0.3f}".format(self.volatility.values[0]),
+            "Skewness: {:0.5f}".format(self.skew),
+            "Kurtosis: {:0.5f}".format(self.kurtosis),
+            "Information:",
+            str(self.investmentinfo.to_frame().transpose()),
+            "-" * 50,
+        ]
+        print("\n".join(lines))
 
     def __str__(self):
         # print short description
@@ -169,6 +180,10 @@ class Portfolio(object):
     To fill the portfolio with investment information, the
     function ``add_stock(stock)`` should be used, in which ``stock`` is
     an object of ``Stock``.
+
+    Quantities derived from ``data``, e.g. daily returns or the covariance
+    matrix, are cached until ``data`` is assigned again. After modifying
+    ``data`` in-place, reassign it (``pf.data = pf.data``) to recompute them.
     """
 
     def __init__(self):
@@ -176,6 +191,12 @@ class Portfolio(object):
         # initilisating instance variables
         self.portfolio = pd.DataFrame()
         self.stocks = {}
+        # stocks that were added, but are not yet part of portfolio/data
+        self._pending_stocks = []
+        # cache of quantities derived from data, e.g. daily returns, which is
+        # valid for one version of data (see _cached)
+        self._cache = {}
+        self._data_version = 0
         self.data = pd.DataFrame()
         self.expected_return = None
         self.volatility = None
@@ -183,6 +204,7 @@ class Portfolio(object):
         self.skew = None
         self.kurtosis = None
         self.totalinvestment = None
+        self._weights = None
         self.risk_free_rate = 0.005
         self.freq = 252
         # instance variables for Efficient Frontier and
@@ -207,6 +229,16 @@ class Portfolio(object):
             else:
                 self.__totalinvestment = val
 
+    @property
+    def data(self):
+        return self.__data
+
+    @data.setter
+    def data(self, val):
+        self.__data = val
+        # data changed, invalidate cached quantities
+        self._invalidate_cache()
+
     @property
     def freq(self):
         return self.__freq
@@ -235,7 +267,7 @@ class Portfolio(object):
             # now that this changed, update other quantities
             self._update()
 
-    def add_stock(self, stock):
+    def add_stock(self, stock, lazy=False):
         """Adds a stock of type ``Stock`` to the portfolio. Each time ``add_stock``
         is called, the following instance variables are updated:
 
@@ -251,41 +283,143 @@ class Portfolio(object):
         - ``skew``: Skewness of the portfolio's stocks
         - ``kurtosis``: Kurtosis of the portfolio's stocks
 
+        If ``lazy`` is ``True``, only ``stocks`` is updated, and the remaining
+        instance variables are updated for all added stocks at once, the next
+        time ``finalize`` is called.
+
+        The stock prices are aligned on their index (dates). If the stocks cover
+        different date ranges, ``data`` covers all of their dates, and prices
+        outside of the date range of a stock are ``NaN``.
+
         :Input:
          :stock: an object of ``Stock``
+         :lazy: ``boolean`` (default= ``False``), whether to defer updating the
+             portfolio until ``finalize`` is called.
         """
+        if stock.name in self.stocks:
+            raise ValueError(
+                "Stock {} is already part of the portfolio.".format(stock.name)
+            )
         # adding stock to dictionary containing all stocks provided
         self.stocks.update({stock.name: stock})
-        # adding information of stock to the portfolio
-        self.portfolio = self.portfolio.append(stock.investmentinfo, ignore_index=True)
+        # remember stock, so that its information/data is added in finalize
+        self._pending_stocks.append(stock)
+        if not lazy:
+            self.finalize()
+
+    def finalize(self):
+        """Adds the information and data of all stocks that were added with
+        ``add_stock(stock, lazy=True)`` to ``portfolio`` and ``data``, and
+        (re-)computes the quantities of the portfolio once.
+        """
+        if not self._pending_stocks:
+            return
+        # add stock data of stocks to the dataframe
+        try:
+            self._add_stock_data(
+                pd.concat([stock.data for stock in self._pending_stocks], axis=1)
+            )
+        except ValueError:
+            # drop the stocks that could not be added
+            for stock in self._pending_stocks:
+                self.stocks.pop(stock.name, None)
+            self._pending_stocks = []
+            raise
+        # adding information of stocks to the portfolio
+        infos = pd.DataFrame([stock.investmentinfo for stock in self._pending_stocks])
+        if self.portfolio.empty:
+            self.portfolio = infos.reset_index(drop=True)
+        else:
+            self.portfolio = pd.concat([self.portfolio, infos], ignore_index=True)
         # setting an appropriate name for the portfolio
         self.portfolio.name = "Allocation of stocks"
-        # also add stock data of stock to the dataframe
-        self._add_stock_data(stock.data)
+        self._pending_stocks = []
 
         # update quantities of portfolio
         self._update()
 
     def _add_stock_data(self, df):
-        # loop over columns in given dataframe
-        for datacol in df.columns:
-            cols = len(self.data.columns)
-            self.data.insert(loc=cols, column=datacol, value=df[datacol].values)
-        # set index correctly
-        self.data.set_index(df.index.values, inplace=True)
+        # column labels must be unique, as they identify the stocks
+        duplicates = df.columns[df.columns.duplicated()].union(
+            df.columns.intersection(self.data.columns)
+        )
+        if len(duplicates) > 0:
+            raise ValueError(
+                "Data columns {} are already part of the portfolio.".format(
+                    list(duplicates)
+                )
+            )
+        # append all columns of the given dataframe at once, aligned on
+        # the index (dates)
+        if self.data.empty:
+            self.data = df.copy()
+        else:
+            self.data = pd.concat([self.data, df], axis=1)
         # set index name:
         self.data.index.rename("Date", inplace=True)
 
+    def _invalidate_cache(self):
+        """Starts a new version of ``data``, and drops all cached quantities."""
+        self._data_version += 1
+        self._cache = {}
+
+    def _cached(self, key, fun):
+        """Returns the result of ``fun()``, which is only computed if no result
+        is cached for ``key`` and the current version of ``data`` yet.
+
+        Assigning ``data`` (also in ``add_stock`` and ``downcast``) starts a new
+        version. In-place modifications of ``data`` are not detected, they
+        require to reassign ``data`` or to call ``_invalidate_cache``.
+        """
+        key = (self._data_version,) + key
+        if key not in self._cache:
+            self._cache[key] = fun()
+        return self._cache[key]
+
     def _update(self):
         # sanity check (only update values if none of the below is empty):
         if not (self.portfolio.empty or self.stocks == {} or self.data.empty):
             self.totalinvestment = self.portfolio.Allocation.sum()
-            self.expected_return = self.comp_expected_return(freq=self.freq)
-            self.volatility = self.comp_volatility(freq=self.freq)
-            self.sharpe = self.comp_sharpe()
+            # weights of the stocks in respect of the total investment
+            self._weights = (
+                np.asarray(self.portfolio["Allocation"].values, dtype=np.float64)
+                / self.totalinvestment
+            )
+            (
+                self.expected_return,
+                self.volatility,
+                self.sharpe,
+            ) = self.comp_risk_return_stats(freq=self.freq, weights=self._weights)
             self.skew = self._comp_skew()
             self.kurtosis = self._comp_kurtosis()
 
+    def downcast(self):
+        """Reduces the memory footprint of the portfolio by converting
+
+        - the stock prices in ``data`` to ``float32``, and
+        - the columns of ``portfolio`` which only contain strings, e.g. ``Name``,
+          ``Strategy`` or ``CCY``, to ``category``.
+
+        The quantities of the portfolio are recomputed afterwards. Daily returns,
+        mean returns and the covariance are computed from the ``float32`` prices
+        without converting them to ``float64`` first. The instances of ``Stock``
+        in ``stocks`` keep their own data and are not converted.
+
+        .. note:: ``float32`` only holds about 7 significant digits, hence
+            the quantities of the portfolio lose precision accordingly.
+        """
+        self.finalize()
+        self.data = self.data.astype(np.float32)
+        for col in self.portfolio.columns:
+            if col != "Allocation" and all(
+                isinstance(val, str) for val in self.portfolio[col].values
+            ):
+                self.portfolio[col] = self.portfolio[col].astype("category")
+        # data changed, invalidate optimisations
+        self.ef = None
+        self.mc = None
+        self._update()
+
     def get_stock(self, name):
         """Returns the instance of ``Stock`` with name ``name``.
 
@@ -315,8 +449,11 @@ class Portfolio(object):
         :Output:
          :ret: a ``pandas.DataFrame`` of daily percentage change of Returns
              of given stock prices.
+
+        .. note:: The result is cached and shared with other computations of
+            the portfolio, hence it must not be modified in-place.
         """
-        return daily_returns(self.data)
+        return self._cached(("daily_returns",), lambda: daily_returns(self.data))
 
     def comp_daily_log_returns(self):
         """Computes the daily log returns of all stocks in the portfolio.
@@ -337,8 +474,13 @@ class Portfolio(object):
 
         :Output:
          :ret: a ``pandas.DataFrame`` of historical mean Returns.
+
+        .. note:: The result is cached and shared with other computations of
+            the portfolio, hence it must not be modified in-place.
         """
-        return historical_mean_return(self.data, freq=freq)
+        return self._cached(
+            ("mean_returns", freq), lambda: _mean_returns(self.data, freq=freq)
+        )
 
     def comp_stock_volatility(self, freq=252):
         """Computes the Volatilities of all the stocks individually
@@ -356,51 +498,81 @@ class Portfolio(object):
         return self.comp_daily_returns().std() * np.sqrt(freq)
 
     def comp_weights(self):
-        """Computes and returns a ``pandas.Series`` of the weights/allocation
+        """Returns a ``numpy.ndarray`` of the weights/allocation
         of the stocks of the portfolio.
 
         :Output:
-         :weights: a ``pandas.Series`` with weights/allocation of all stocks
+         :weights: a ``numpy.ndarray`` with weights/allocation of all stocks
              within the portfolio.
         """
-        # computes the weights of the stocks in the given portfolio
-        # in respect of the total investment
-        return self.portfolio["Allocation"] / self.totalinvestment
+        # the weights of the stocks in the given portfolio in respect of the
+        # total investment are computed whenever the portfolio is updated,
+        # return a copy, so that callers cannot modify them
+        return self._weights.copy()
 
-    def comp_expected_return(self, freq=252):
+    def comp_expected_return(self, freq=252, weights=None):
         """Computes the Expected Return of the portfolio.
 
         :Input:
          :freq: ``int`` (default: ``252``), number of trading days, default
              value corresponds to trading days in a year.
+         :weights: ``numpy.ndarray`` (default: ``None``), weights/allocation of
+             the stocks. If ``None``, ``comp_weights()`` is used, and the result
+             is stored in ``expected_return``.
 
         :Output:
          :expected_return: ``float`` the Expected Return of the portfolio.
         """
-        if not isinstance(freq, int):
-            raise ValueError("freq is expected to be an integer.")
-        pf_return_means = historical_mean_return(self.data, freq=freq)
-        weights = self.comp_weights()
-        expected_return = weighted_mean(pf_return_means.values, weights)
-        self.expected_return = expected_return
+        expected_return = self.comp_risk_return_stats(freq=freq, weights=weights)[0]
+        # other weights do not describe this portfolio
+        if weights is None:
+            self.expected_return = expected_return
         return expected_return
 
-    def comp_volatility(self, freq=252):
+    def comp_volatility(self, freq=252, weights=None):
         """Computes the Volatility of the given portfolio.
 
         :Input:
          :freq: ``int`` (default: ``252``), number of trading days, default
              value corresponds to trading days in a year.
+         :weights: ``numpy.ndarray`` (default: ``None``), weights/allocation of
+             the stocks. If ``None``, ``comp_weights()`` is used, and the result
+             is stored in ``volatility``.
 
         :Output:
          :volatility: ``float`` the Volatility of the portfolio.
         """
+        volatility = self.comp_risk_return_stats(freq=freq, weights=weights)[1]
+        # other weights do not describe this portfolio
+        if weights is None:
+            self.volatility = volatility
+        return volatility
+
+    def comp_risk_return_stats(self, freq=252, weights=None):
+        """Computes the Expected Return, Volatility and Sharpe Ratio of the
+        portfolio together. The mean and the covariance of the daily returns
+        are both computed from one array of daily returns, only once per
+        ``data``.
+
+        :Input:
+         :freq: ``int`` (default: ``252``), number of trading days, default
+             value corresponds to trading days in a year.
+         :weights: ``numpy.ndarray`` (default: ``None``), weights/allocation of
+             the stocks. If ``None``, ``comp_weights()`` is used.
+
+        :Output:
+         :(expected_return, volatility, sharpe): tuple of ``floats``, the
+             Expected Return, Volatility and Sharpe Ratio of the portfolio.
+        """
         if not isinstance(freq, int):
             raise ValueError("freq is expected to be an integer.")
-        # computing the volatility of a portfolio
-        volatility = weighted_std(self.comp_cov(), self.comp_weights()) * np.sqrt(freq)
-        self.volatility = volatility
-        return volatility
+        if weights is None:
+            weights = self.comp_weights()
+        means, cov_matrix = self._comp_returns_moments()
+        expected_return = weighted_mean(means * freq, weights)
+        volatility = weighted_std(cov_matrix, weights) * np.sqrt(freq)
+        sharpe = sharpe_ratio(expected_return, volatility, self.risk_free_rate)
+        return (expected_return, volatility, sharpe)
 
     def comp_cov(self):
         """Compute and return a ``pandas.DataFrame`` of the covariance matrix
@@ -408,10 +580,37 @@ class Portfolio(object):
 
         :Output:
          :cov: a ``pandas.DataFrame`` of the covariance matrix of the portfolio.
+
+        .. note:: The result is cached and shared with other computations of
+            the portfolio, hence it must not be modified in-place.
         """
         # get the covariance matrix of the mean returns of the portfolio
-        returns = daily_returns(self.data)
-        return returns.cov()
+        return self._cached(("cov",), lambda: self.comp_daily_returns().cov())
+
+    def _comp_returns_moments(self):
+        """Computes and returns the mean daily returns and the covariance
+        matrix of the daily returns of the portfolio as ``numpy.ndarray``,
+        both from the same array of daily returns.
+        """
+
+        def returns_moments():
+            returns = self.comp_daily_returns()
+            values = returns.to_numpy()
+            num_stocks = values.shape[1]
+            if len(values) < 2 or np.isnan(values).any():
+                # pandas excludes missing values (pairwise for the covariance)
+                means = returns.mean().to_numpy()
+                if len(values) < 2:
+                    # the covariance is undefined (NaN) for fewer than two
+                    # returns, np.cov would warn about the degrees of freedom
+                    return means, np.full((num_stocks, num_stocks), np.nan)
+                return means, self.comp_cov().to_numpy()
+            # mean and covariance accumulate float32 returns in float64
+            means = values.mean(axis=0, dtype=np.float64)
+            cov_matrix = np.atleast_2d(np.cov(values, rowvar=False, ddof=1))
+            return means, cov_matrix
+
+        return self._cached(("returns_moments",), returns_moments)
 
     def comp_sharpe(self):
         """Compute and return the Sharpe Ratio of the portfolio.
@@ -597,7 +796,7 @@ class Portfolio(object):
         ef.plot_optimal_portfolios()
 
     # optimising the investments with the efficient frontier class
-    def _get_mc(self, num_trials=1000):
+    def _get_mc(self, num_trials=1000, n_jobs=1):
         """If self.mc does not exist, create and return an instance of
         finquant.monte_carlo.MonteCarloOpt, else, return the existing instance.
         """
@@ -608,13 +807,14 @@ class Portfolio(object):
                 num_trials=num_trials,
                 risk_free_rate=self.risk_free_rate,
                 freq=self.freq,
-                initial_weights=self.comp_weights().values,
+                initial_weights=self.comp_weights(),
+                n_jobs=n_jobs,
             )
         return self.mc
 
     # optimising the investments by performing a Monte Carlo run
     # based on volatility and sharpe ratio
-    def mc_optimisation(self, num_trials=1000):
+    def mc_optimisation(self, num_trials=1000, n_jobs=1):
         """Interface to
         ``finquant.monte_carlo.MonteCarloOpt.optimisation``.
 
@@ -625,6 +825,8 @@ class Portfolio(object):
          :num_trials: ``int`` (default: ``1000``), number of portfolios to be
              computed, each with a random distribution of weights/allocation
              in each stock.
+         :n_jobs: ``int`` (default: ``1``), number of threads the Monte Carlo
+             run is split across.
 
         :Output:
          :opt_w: ``pandas.DataFrame`` with optimised investment strategies for maximum
@@ -635,7 +837,7 @@ class Portfolio(object):
         # dismiss previous instance of mc, as we are performing a new MC optimisation:
         self.mc = None
         # get instance of MonteCarloOpt
-        mc = self._get_mc(num_trials)
+        mc = self._get_mc(num_trials, n_jobs)
         opt_weights, opt_results = mc.optimisation()
         return opt_weights, opt_results
 
@@ -695,23 +897,27 @@ class Portfolio(object):
         as well as the allocation of the stocks across the portfolio.
         """
         # nicely printing out information and quantities of the portfolio
-        string = "-" * 70
         stocknames = self.portfolio.Name.values.tolist()
-        string += "\nStocks: {}".format(", ".join(stocknames))
-        string += "\nTime window/frequency: {}".format(self.freq)
-        string += "\nRisk free rate: {}".format(self.risk_free_rate)
-        string += "\nPortfolio Expected Return: {:0.3f}".format(self.expected_return)
-        string += "\nPortfolio Volatility: {:0.3f}".format(self.volatility)
-        string += "\nPortfolio Sharpe Ratio: {:0.3f}".format(self.sharpe)
-        string += "\n\nSkewness:"
-        string += "\n" + str(self.skew.to_frame().transpose())
-        string += "\n\nKurtosis:"
-        string += "\n" + str(self.kurtosis.to_frame().transpose())
-        string += "\n\nInformation:"
-        string += "\n" + str(self.portfolio)
-        string += "\n"
-        string += "-" * 70
-        print(string)
+        lines = [
+            "-" * 70,
+            "Stocks: {}".format(", ".join(stocknames)),
+            "Time window/frequency: {}".format(self.freq),
+            "Risk free rate: {}".format(self.risk_free_rate),
+            "Portfolio Expected Return: {:0.3f}".format(self.expected_return),
+            "Portfolio Volatility: {:0.3f}".format(self.volatility),
+            "Portfolio Sharpe Ratio: {:0.3f}".format(self.sharpe),
+            "",
+            "Skewness:",
+            str(self.skew.to_frame().transpose()),
+            "",
+            "Kurtosis:",
+            str(self.kurtosis.to_frame().transpose()),
+            "",
+            "Information:",
+            str(self.portfolio),
+            "-" * 70,
+        ]
+        print("\n".join(lines))
 
     def __str__(self):
         # print short description
@@ -719,6 +925,27 @@ class Portfolio(object):
         return string
 
 
+def _prices_array(data):
+    """Returns the stock prices in the ``pandas.DataFrame`` data as
+    ``numpy.ndarray`` of floats, ``float32`` prices are not converted.
+    """
+    prices = data.to_numpy()
+    if prices.dtype.kind != "f":
+        prices = data.to_numpy(dtype=np.float64)
+    return prices
+
+
+def _mean_returns(data, freq=252):
+    """Returns the mean returns of the stocks in the ``pandas.DataFrame`` data,
+    see ``finquant.returns.historical_mean_return``. Regular stock prices are
+    processed in a single pass, see ``finquant._kernels.mean_returns``.
+    """
+    prices = _prices_array(data)
+    if len(prices) > 1 and is_regular(prices):
+        return pd.Series(mean_returns(prices, freq), index=data.columns)
+    return historical_mean_return(data, freq=freq)
+
+
 def _correct_quandl_request_stock_name(names):
     """If given input argument is of type string,
     this function converts it to a list, assuming the input argument
@@ -842,28 +1069,31 @@ def _get_stocks_data_columns(data, names, cols):
     reqnames = _correct_quandl_request_stock_name(names)
     # get current column labels and replacement labels
     reqcolnames = []
+    newcolnames = []
     # if dataframe is of type multiindex, also get first level colname
     firstlevel_colnames = []
+    # set of (first level) column labels for constant time lookups
+    colset = set(data.columns.get_level_values(0))
     for i in range(len(names)):
         for col in cols:
             # differ between dataframe directly from quandl and
             # possibly previously processed dataframe, e.g.
             # read in from disk with slightly modified column labels
             # 1. if <stock_name> in column labels
-            if names[i] in data.columns:
-                colname = names[i]
             # 2. if "WIKI/<stock_name> - <col>" in column labels
-            elif _get_quandl_data_column_label(reqnames[i], col) in data.columns:
-                colname = _get_quandl_data_column_label(reqnames[i], col)
             # 3. if "<stock_name> - <col>" in column labels
-            elif _get_quandl_data_column_label(names[i], col) in data.columns:
-                colname = _get_quandl_data_column_label(names[i], col)
+            candidates = [
+                names[i],
+                _get_quandl_data_column_label(reqnames[i], col),
+                _get_quandl_data_column_label(names[i], col),
+            ]
+            colname = next((label for label in candidates if label in colset), None)
             # if column labels is of type multiindex, and the "Adj Close" is in
             # first level labels, we assume the dataframe comes from yfinance:
-            elif isinstance(data.columns, pd.MultiIndex):
+            if colname is None and isinstance(data.columns, pd.MultiIndex):
                 # alter col for yfinance, as it returns column labels without '.'
                 col = col.replace(".", "")
-                if col in data.columns:
+                if col in colset:
                     if not col in firstlevel_colnames:
                         firstlevel_colnames.append(col)
                     if names[i] in data[col].columns:
@@ -873,10 +1103,12 @@ def _get_stocks_data_columns(data, names, cols):
                             "Could not find column labels in second level of MultiIndex pd.DataFrame"
                         )
             # else, error
-            else:
+            if colname is None:
                 raise ValueError("Could not find column labels in given dataframe.")
-            # append correct name to list of correct names
+            # append correct name to list of correct names, and the name of
+            # the corresponding stock to the list of replacement labels
             reqcolnames.append(colname)
+            newcolnames.append(names[i])
 
     # if data comes from yfinance, it is a multiindex dataframe:
     if isinstance(data.columns, pd.MultiIndex):
@@ -889,15 +1121,10 @@ def _get_stocks_data_columns(data, names, cols):
         # if it comes from quandl, it is not of type multiindex
         data = data.loc[:, reqcolnames]
 
-    # if only one data column per stock exists, rename column labels
+    # if only one data column per stock exists, set column labels
     # to the name of the corresponding stock
-    newcolnames = {}
     if len(cols) == 1:
-        for i in range(len(names)):
-            newcolnames.update(
-                {_get_quandl_data_column_label(names[i], cols[0]): names[i]}
-            )
-        data.rename(columns=newcolnames, inplace=True)
+        data.columns = newcolnames
     return data
 
 
@@ -944,7 +1171,18 @@ def _stocknames_in_data_columns(names, df):
     """Returns True if at least one element of names was found as a column
     label in the dataframe df.
     """
-    return any((name in label for name in names for label in df.columns))
+    if len(names) == 0 or len(df.columns) == 0:
+        return False
+    if isinstance(df.columns, pd.MultiIndex):
+        # column labels are tuples, names must match one of their elements
+        # (the levels of a sliced MultiIndex may hold unused values)
+        labels = set()
+        for i in range(df.columns.nlevels):
+            labels.update(df.columns.get_level_values(i))
+        return any(name in labels for name in names)
+    # search for all names in all column labels with one regular expression
+    pattern = re.compile("|".join(re.escape(str(name)) for name in names))
+    return bool(pattern.search("\n".join(str(label) for label in df.columns)))
 
 
 def _generate_pf_allocation(names=None, data=None):
@@ -1037,34 +1275,40 @@ def _build_portfolio_from_df(data, pf_allocation=None, datacolumns=["Adj. Close"
     # extract only "Adjusted Close" price ("Adj. Close" in quandl, "Adj Close" in yfinance)
     # column from DataFrame:
     data = _get_stocks_data_columns(data, pf_allocation.Name.values, datacolumns)
+    # store prices as NumPy float64, also if data was provided with e.g.
+    # Arrow-backed or nullable dtypes, so that returns, covariance and the
+    # kernels in finquant._kernels operate on plain float arrays (data which
+    # already is float64 is not copied)
+    if not (data.dtypes == np.float64).all():
+        data = data.astype(np.float64)
     # building portfolio:
     pf = Portfolio()
-    for i in range(len(pf_allocation)):
+    for _, investmentinfo in pf_allocation.iterrows():
         # get name of stock
-        name = pf_allocation.loc[i].Name
-        # extract data column(s) of said stock
+        name = investmentinfo.Name
+        # extract data column(s) of said stock, the column labels of data
+        # are the stock names at this point, so no search is required
         stock_data = data.loc[:, [name]].copy(deep=True)
         # if only one data column per stock exists, give dataframe a name
         if len(datacolumns) == 1:
             stock_data.name = datacolumns[0]
         # create Stock instance and add it to portfolio
-        pf.add_stock(Stock(pf_allocation.loc[i], data=stock_data))
+        pf.add_stock(Stock(investmentinfo, data=stock_data), lazy=True)
+    # add all stocks to the portfolio and compute its quantities at once
+    pf.finalize()
     return pf
 
 
-def _all_list_ele_in_other(l1, l2):
-    """Returns True if all elements of list l1 are found in list l2."""
-    return all(ele in l2 for ele in l1)
-
-
-def _any_list_ele_in_other(l1, l2):
-    """Returns True if any element of list l1 is found in list l2."""
-    return any(ele in l2 for ele in l1)
-
-
-def _list_complement(A, B):
-    """Returns the relative complement of A in B (also denoted as A\\B)"""
-    return list(set(B) - set(A))
+# all valid optional input arguments of build_portfolio
+_ALL_INPUT_ARGS = frozenset(
+    ["pf_allocation", "names", "start_date", "end_date", "data", "data_api"]
+)
+# input arguments that are not allowed in combination with "names"
+_NAMES_COMPLEMENT_ARGS = _ALL_INPUT_ARGS - frozenset(
+    ["names", "pf_allocation", "start_date", "end_date", "data_api"]
+)
+# input arguments that are not allowed in combination with "data"
+_DATA_COMPLEMENT_ARGS = _ALL_INPUT_ARGS - frozenset(["data", "pf_allocation"])
 
 
 def build_portfolio(**kwargs):
@@ -1125,59 +1369,38 @@ def build_portfolio(**kwargs):
         "in combination with {}.\n" + docstring_msg
     )
 
-    # list of all valid optional input arguments
-    all_input_args = [
-        "pf_allocation",
-        "names",
-        "start_date",
-        "end_date",
-        "data",
-        "data_api",
-    ]
-
     # check if no input argument was passed
     if kwargs == {}:
         raise ValueError(
             "Error:\nbuild_portfolio() requires input " + "arguments.\n" + docstring_msg
         )
     # check for valid input arguments
-    if not _all_list_ele_in_other(kwargs.keys(), all_input_args):
-        unsupported_input = _list_complement(all_input_args, kwargs.keys())
+    unsupported_input = kwargs.keys() - _ALL_INPUT_ARGS
+    if unsupported_input:
         raise ValueError(
-            "Error:\n" + input_error.format(unsupported_input, all_input_args)
+            "Error:\n"
+            + input_error.format(sorted(unsupported_input), sorted(_ALL_INPUT_ARGS))
         )
 
     # create an empty portfolio
     pf = Portfolio()
 
     # 1. pf_allocation, names, start_date, end_date, data_api
-    allowed_mandatory_args = ["names"]
-    allowed_input_args = [
-        "names",
-        "pf_allocation",
-        "start_date",
-        "end_date",
-        "data_api",
-    ]
-    complement_input_args = _list_complement(allowed_input_args, all_input_args)
-    if _all_list_ele_in_other(allowed_mandatory_args, kwargs.keys()):
+    if "names" in kwargs:
         # check that no input argument conflict arises:
-        if _any_list_ele_in_other(complement_input_args, kwargs.keys()):
+        if not _NAMES_COMPLEMENT_ARGS.isdisjoint(kwargs):
             raise ValueError(
-                input_comb_error.format(complement_input_args, allowed_mandatory_args)
+                input_comb_error.format(sorted(_NAMES_COMPLEMENT_ARGS), ["names"])
             )
         # get portfolio:
         pf = _build_portfolio_from_api(**kwargs)
 
     # 2. pf_allocation, data
-    allowed_mandatory_args = ["data"]
-    allowed_input_args = ["data", "pf_allocation"]
-    complement_input_args = _list_complement(allowed_input_args, all_input_args)
-    if _all_list_ele_in_other(allowed_mandatory_args, kwargs.keys()):
+    if "data" in kwargs:
         # check that no input argument conflict arises:
-        if _any_list_ele_in_other(complement_input_args, kwargs.keys()):
+        if not _DATA_COMPLEMENT_ARGS.isdisjoint(kwargs):
             raise ValueError(
-                input_comb_error.format(complement_input_args, allowed_mandatory_args)
+                input_comb_error.format(sorted(_DATA_COMPLEMENT_ARGS), ["data"])
             )
         # get portfolio:
         pf = _build_portfolio_from_df(**kwargs)
@@ -98,3 +98,35 @@ def annualised_portfolio_quantities(
     volatility = weighted_std(cov_matrix, weights) * np.sqrt(freq)
     sharpe = sharpe_ratio(expected_return, volatility, risk_free_rate)
     return (expected_return, volatility, sharpe)
+
+
+def annualised_portfolio_quantities_batch(
+    weights, means, cov_matrix, risk_free_rate=0.005, freq=252
+):
+    """Computes and returns the expected annualised return, volatility
+    and Sharpe Ratio of several portfolios at once, see
+    ``annualised_portfolio_quantities``.
+
+    :Input:
+     :weights: ``numpy.ndarray`` of weights, one row per portfolio
+     :means: ``numpy.ndarray``/``pd.Series`` of mean/average values
+     :cov_matrix: ``numpy.ndarray``/``pandas.DataFrame``, covariance matrix
+     :risk_free_rate: ``float`` (default= ``0.005``), risk free rate
+     :freq: ``int`` (default= ``252``), number of trading days, default
+         value corresponds to trading days in a year
+
+    :Output:
+     :quantities: ``numpy.ndarray`` of [Expected Return, Volatility,
+         Sharpe Ratio], one row per portfolio
+    """
+    if not isinstance(freq, int):
+        raise ValueError("freq is expected to be an integer.")
+    weights = np.atleast_2d(weights)
+    means = np.asarray(means)
+    cov_matrix = np.asarray(cov_matrix)
+    expected_return = np.dot(weights, means) * freq
+    volatility = np.sqrt(
+        np.sum(np.dot(weights, cov_matrix) * weights, axis=1)
+    ) * np.sqrt(freq)
+    sharpe = (expected_return - risk_free_rate) / volatility
+    return np.column_stack((expected_return, volatility, sharpe))
@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+from finquant._kernels import is_regular, mean_returns, volatility
+from finquant.returns import daily_returns, historical_mean_return
+
+
+def test_is_regular():
+    assert is_regular(np.array([1.0, 2.0, 3.0]))
+    assert not is_regular(np.array([1.0, np.nan, 3.0]))
+    assert not is_regular(np.array([1.0, 0.0, 3.0]))
+    assert not is_regular(np.array([1.0, np.inf, 3.0]))
+
+
+def test_volatility():
+    prices = [10 * 0.2 + i * 0.25 + (-1) ** i * 0.1 for i in range(1, 21)]
+    df = pd.DataFrame({"1": prices})
+    orig = daily_returns(df).std().values[0] * np.sqrt(252)
+    assert abs(volatility(np.array(prices)) - orig) <= 1e-14
+    orig = daily_returns(df).std().values[0] * np.sqrt(5)
+    assert abs(volatility(np.array(prices), freq=5) - orig) <= 1e-14
+
+
+def test_mean_returns():
+    l1 = range(1, 21)
+    l2 = [10 * 0.2 + i * 0.25 + (-1) ** i * 0.1 for i in range(1, 21)]
+    df = pd.DataFrame({"1": l1, "2": l2})
+    orig = historical_mean_return(df).values
+    assert all(abs(mean_returns(df.values) - orig) <= 1e-14)
+    orig = historical_mean_return(df, freq=5).values
+    assert all(abs(mean_returns(df.values, freq=5) - orig) <= 1e-14)
@@ -4,6 +4,7 @@
 ###############################################################
 import os
 import pathlib
+import warnings
 import numpy as np
 import pandas as pd
 import matplotlib.pylab as plt
@@ -12,7 +13,10 @@ import quandl
 import yfinance
 import pytest
 from finquant.portfolio import build_portfolio, Stock, Portfolio
+from finquant.portfolio import _stocknames_in_data_columns
 from finquant.efficient_frontier import EfficientFrontier
+from finquant.quants import weighted_mean, weighted_std, sharpe_ratio
+from finquant.returns import daily_returns, historical_mean_return
 
 # comparisons
 strong_abse = 1e-15
@@ -427,6 +431,219 @@ def test_Stock():
         )
 
 
+#######################
+# tests for Portfolio #
+#######################
+
+
+def test_add_stock_lazy():
+    d = d_pass[6]
+    stocks = list(build_portfolio(**d).stocks.values())
+    # reference portfolio, built stock by stock
+    pf_ref = Portfolio()
+    for stock in stocks:
+        pf_ref.add_stock(stock)
+    # lazy adds only update stocks until finalize is called
+    pf = Portfolio()
+    for stock in stocks:
+        pf.add_stock(stock, lazy=True)
+    assert list(pf.stocks) == names
+    assert pf.portfolio.empty
+    assert pf.data.empty
+    pf.finalize()
+    assert pf.portfolio.index.tolist() == list(range(len(names)))
+    assert pf.portfolio.equals(pf_ref.portfolio)
+    assert pf.data.equals(pf_ref.data)
+    assert abs(pf.expected_return - pf_ref.expected_return) <= strong_abse
+    assert abs(pf.volatility - pf_ref.volatility) <= strong_abse
+    assert abs(pf.sharpe - pf_ref.sharpe) <= strong_abse
+    assert all(abs(pf.skew - pf_ref.skew) <= strong_abse)
+    assert all(abs(pf.kurtosis - pf_ref.kurtosis) <= strong_abse)
+    # a non-lazy add also adds all pending stocks
+    pf = Portfolio()
+    pf.add_stock(stocks[0], lazy=True)
+    pf.add_stock(stocks[1], lazy=True)
+    pf.add_stock(stocks[2])
+    assert pf.portfolio.index.tolist() == [0, 1, 2]
+    assert pf.portfolio["Name"].tolist() == names[:3]
+    assert pf.data.columns.tolist() == names[:3]
+    for stock in stocks[3:]:
+        pf.add_stock(stock)
+    assert pf.portfolio.index.tolist() == list(range(len(names)))
+    assert pf.portfolio.equals(pf_ref.portfolio)
+    assert abs(pf.expected_return - pf_ref.expected_return) <= strong_abse
+    assert abs(pf.volatility - pf_ref.volatility) <= strong_abse
+
+
+def test_add_stock_duplicates():
+    d = d_pass[6]
+    pf = build_portfolio(**d)
+    stock = pf.get_stock(names[0])
+    with pytest.raises(ValueError):
+        pf.add_stock(stock)
+    # different name, but same data column label
+    investmentinfo = pd.Series({"Allocation": 10.0, "Name": "WIKI/GOOG2"})
+    with pytest.raises(ValueError):
+        pf.add_stock(Stock(investmentinfo, data=stock.data))
+    assert len(pf.stocks) == len(names)
+    assert len(pf.portfolio) == len(names)
+    assert pf.data.columns.tolist() == names
+
+
+def test_add_stock_date_ranges():
+    pf = Portfolio()
+    for i, (start, end) in enumerate([(0, 300), (100, None)]):
+        investmentinfo = df_pf.loc[i]
+        stock_data = df_data.loc[:, [investmentinfo.Name]].iloc[start:end]
+        pf.add_stock(Stock(investmentinfo, data=stock_data))
+    # data covers the union of dates, prices outside of a range are NaN
+    assert pf.data.index.equals(df_data.index)
+    assert pf.data[names[0]].iloc[300:].isna().all()
+    assert pf.data[names[1]].iloc[:100].isna().all()
+    assert pf.expected_return is not None
+    assert pf.volatility is not None
+
+
+def test_stocknames_in_data_columns():
+    # flat column labels
+    assert _stocknames_in_data_columns(["GOOG"], df_data)
+    assert _stocknames_in_data_columns(["XYZ", "GOOG"], df_data)
+    assert not _stocknames_in_data_columns(["XYZ"], df_data)
+    assert not _stocknames_in_data_columns([], df_data)
+    assert not _stocknames_in_data_columns(["GOOG"], pd.DataFrame())
+    # MultiIndex column labels
+    columns = pd.MultiIndex.from_product([["Adj Close", "Close"], names])
+    df = pd.DataFrame(np.ones((3, len(columns))), columns=columns)
+    assert _stocknames_in_data_columns([names[0]], df)
+    assert _stocknames_in_data_columns(["Close"], df)
+    assert not _stocknames_in_data_columns(["XYZ"], df)
+    # unused level values of a sliced MultiIndex must not match
+    df_sliced = df.loc[:, df.columns.get_level_values(1) == names[0]]
+    assert _stocknames_in_data_columns([names[0]], df_sliced)
+    assert not _stocknames_in_data_columns([names[1]], df_sliced)
+
+
+def test_cache_invalidation():
+    d = d_pass[6]
+    pf = build_portfolio(**d)
+
+    def expret(pf):
+        # Expected Return computed without the cache of pf
+        means = historical_mean_return(pf.data, freq=pf.freq).values
+        return weighted_mean(means, pf.comp_weights())
+
+    assert abs(pf.comp_expected_return(freq=pf.freq) - expret(pf)) <= weak_abse
+    # in-place modification of data, cached quantities are kept until data
+    # is reassigned
+    expected_return = pf.comp_expected_return(freq=pf.freq)
+    pf.data.iloc[-1, 0] *= 2.0
+    assert pf.comp_expected_return(freq=pf.freq) == expected_return
+    pf.data = pf.data
+    assert abs(pf.comp_expected_return(freq=pf.freq) - expected_return) > weak_abse
+    assert abs(pf.comp_expected_return(freq=pf.freq) - expret(pf)) <= weak_abse
+    # explicit invalidation of the cache
+    expected_return = pf.comp_expected_return(freq=pf.freq)
+    pf.data.iloc[-1, 0] /= 2.0
+    pf._invalidate_cache()
+    assert abs(pf.comp_expected_return(freq=pf.freq) - expected_return) > weak_abse
+    assert abs(pf.comp_expected_return(freq=pf.freq) - expret(pf)) <= weak_abse
+    # reassigning data
+    pf.data = pf.data.iloc[:100]
+    assert len(pf.comp_daily_returns()) == 99
+    assert abs(pf.comp_expected_return(freq=pf.freq) - expret(pf)) <= weak_abse
+    # adding a stock
+    investmentinfo = pd.Series({"Allocation": 10.0, "Name": "WIKI/GOOG2"})
+    stock_data = pf.data.loc[:, ["WIKI/GOOG"]].rename(
+        columns={"WIKI/GOOG": "WIKI/GOOG2"}
+    )
+    stock_data.iloc[::2] *= 1.01
+    pf.add_stock(Stock(investmentinfo, data=stock_data))
+    assert pf.comp_cov().shape == (5, 5)
+    assert abs(pf.comp_expected_return(freq=pf.freq) - expret(pf)) <= weak_abse
+
+
+def test_comp_risk_return_stats():
+    d = d_pass[6]
+    pf = build_portfolio(**d)
+    weights = pf.portfolio["Allocation"] / pf.portfolio["Allocation"].sum()
+    for freq in [1, 252]:
+        # reference values, computed with pandas
+        expected_return_orig = weighted_mean(
+            historical_mean_return(pf.data, freq=freq).values, weights
+        )
+        volatility_orig = weighted_std(daily_returns(pf.data).cov(), weights)
+        volatility_orig *= np.sqrt(freq)
+        sharpe_orig = sharpe_ratio(
+            expected_return_orig, volatility_orig, pf.risk_free_rate
+        )
+        expected_return, volatility, sharpe = pf.comp_risk_return_stats(freq=freq)
+        assert abs(expected_return - expected_return_orig) <= weak_abse
+        assert abs(volatility - volatility_orig) <= weak_abse
+        assert abs(sharpe - sharpe_orig) <= weak_abse
+        assert abs(pf.comp_expected_return(freq=freq) - expected_return) <= weak_abse
+        assert abs(pf.comp_volatility(freq=freq) - volatility) <= weak_abse
+    assert abs(pf.expected_return - expected_return) <= weak_abse
+    assert abs(pf.volatility - volatility) <= weak_abse
+    assert abs(pf.sharpe - sharpe) <= weak_abse
+
+
+def test_comp_weights():
+    d = d_pass[6]
+    pf = build_portfolio(**d)
+    weights_orig = (pf.portfolio["Allocation"] / pf.totalinvestment).values
+    weights = pf.comp_weights()
+    assert np.allclose(weights, weights_orig, rtol=0, atol=strong_abse)
+    # modifying the returned weights does not change the portfolio
+    weights *= 2.0
+    assert np.allclose(pf.comp_weights(), weights_orig, rtol=0, atol=strong_abse)
+    assert abs(pf.comp_expected_return() - pf.expected_return) <= strong_abse
+
+
+def test_comp_custom_weights():
+    d = d_pass[6]
+    pf = build_portfolio(**d)
+    expected_return = pf.expected_return
+    volatility = pf.volatility
+    sharpe = pf.sharpe
+    weights = np.full(len(names), 1.0 / len(names))
+    # custom weights do not change the quantities of the portfolio
+    assert abs(pf.comp_expected_return(weights=weights) - expected_return) > weak_abse
+    assert abs(pf.comp_volatility(weights=weights) - volatility) > weak_abse
+    assert pf.expected_return == expected_return
+    assert pf.volatility == volatility
+    assert pf.comp_sharpe() == sharpe
+
+
+def test_comp_risk_return_stats_one_return():
+    d = d_pass[6]
+    pf = build_portfolio(**d)
+    # two prices give a single daily return, the Volatility is undefined
+    pf.data = pf.data.iloc[:2]
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        volatility = pf.comp_risk_return_stats()[1]
+    assert np.isnan(volatility)
+
+
+def test_downcast():
+    d = d_pass[6]
+    pf = build_portfolio(**d)
+    expected_return = pf.expected_return
+    volatility = pf.volatility
+    memory_usage = pf.data.memory_usage(index=False).sum()
+    pf.downcast()
+    assert (pf.data.dtypes == np.float32).all()
+    assert pf.data.memory_usage(index=False).sum() <= memory_usage / 2
+    # computations do not convert the prices back to float64
+    assert (pf.comp_daily_returns().dtypes == np.float32).all()
+    assert (pf.data.dtypes == np.float32).all()
+    assert isinstance(pf.portfolio["Name"].dtype, pd.CategoricalDtype)
+    assert pf.data.columns.tolist() == names
+    assert abs(pf.expected_return - expected_return) <= 1e-5
+    assert abs(pf.volatility - volatility) <= 1e-5
+    pf.properties()
+
+
 ######################################
 # tests for Monte Carlo optimisation #
 ######################################
@@ -478,6 +695,22 @@ def test_mc_optimisation():
     assert ylabel_orig == ylabel_plot
 
 
+def test_mc_optimisation_n_jobs():
+    d = d_pass[6]
+    pf = build_portfolio(**d)
+    # splitting the Monte Carlo run across threads must not change the results
+    np.random.seed(seed=0)
+    opt_w_1, opt_res_1 = pf.mc_optimisation(num_trials=500)
+    assert pf.mc.n_jobs == 1
+    # a new instance of MonteCarloOpt is required for a different n_jobs
+    pf.mc = None
+    np.random.seed(seed=0)
+    opt_w_4, opt_res_4 = pf.mc_optimisation(num_trials=500, n_jobs=4)
+    assert np.allclose(opt_w_1.values, opt_w_4.values, atol=strong_abse)
+    assert pf.mc.n_jobs == 4
+    assert np.allclose(opt_res_1.values, opt_res_4.values, atol=strong_abse)
+
+
 #############################################
 # tests for Efficient Frontier optimisation #
 #############################################
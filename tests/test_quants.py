@@ -1,6 +1,7 @@
 import numpy as np
 from finquant.quants import weighted_mean, weighted_std
 from finquant.quants import sharpe_ratio, annualised_portfolio_quantities
+from finquant.quants import annualised_portfolio_quantities_batch
 
 
 def test_weighted_mean():
@@ -38,3 +39,17 @@ def test_annualised_portfolio_quantities():
     orig = (1764, 347.79304190854657, 5.071981861166303)
     for i in range(len(res)):
         assert abs(res[i] - orig[i]) <= 1e-15
+
+
+def test_annualised_portfolio_quantities_batch():
+    x = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9])
+    y = np.array([9, 8, 7, 6, 5, 4, 3, 2, 1])
+    Sigma = np.cov(x, y)
+    mean = np.array([1, 2])
+    weights = np.array([[-3, 5], [0.25, 0.75], [1, 0]])
+    res = annualised_portfolio_quantities_batch(weights, mean, Sigma, 0.005, 252)
+    assert res.shape == (3, 3)
+    for i in range(len(weights)):
+        orig = annualised_portfolio_quantities(weights[i], mean, Sigma, 0.005, 252)
+        for j in range(len(orig)):
+            assert abs(res[i, j] - orig[j]) <= 1e-12 * max(1, abs(orig[j]))